@@ -1,7 +1,14 @@
 import math
+import os
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import rasterio
 from rasterio.enums import Resampling
+from rasterio.windows import Window
+
+# A parallel raster read only pays for its extra dataset handles when each
+# worker has at least this many compressed blocks to decode
+_BLOCKS_PER_WORKER = 32
 
 class FireGrid:
     # Cell‐state constants
@@ -9,6 +16,14 @@ class FireGrid:
     BURNING  = 1
     BURNED   = 2
 
+    # Burn/ignition progress is fixed-point uint16: PROGRESS_ONE stands for 1.0
+    PROGRESS_ONE = 65535
+
+    # The state is encoded in burn_progress: 0 → UNBURNED, (0,1) → BURNING,
+    # 1 → BURNED.  A freshly ignited cell starts at the smallest positive value.
+    BP_IGNITED = 1
+    BP_DONE    = PROGRESS_ONE
+
     def __init__(self, rows: int, cols: int, cell_size: float):
         """
         Initialize a fire simulation grid.
@@ -21,12 +36,49 @@ class FireGrid:
         self.cols      = cols
         self.cell_size = cell_size
 
-        # Grid data per cell
-        self.grid_state        = np.zeros((rows, cols), dtype=np.uint8)  #TODO: change self.grid to self.grid_state
-        self.burn_progress     = np.zeros((rows, cols), dtype=np.float32)
-        self.ignition_progress = np.zeros((rows, cols), dtype=np.float32)
+        # Grid data per cell (fire state is derived from burn_progress)
+        self.burn_progress     = np.zeros((rows, cols), dtype=np.uint16)
+        self.ignition_progress = np.zeros((rows, cols), dtype=np.uint16)
         self.landcover         = None
-        self.flammability      = np.ones((rows, cols), dtype=np.float32)
+
+        # Flammability as a per-cell class index into a small LUT
+        self.klass             = np.zeros((rows, cols), dtype=np.uint8)
+        self.flammability_lut  = np.ones(1, dtype=np.float32)
+
+        # Landcover RGB images, memoized per (color map, unknown color)
+        self._rgb_cache        = {}
+
+        # Flat (i*cols + j) indices of all BURNING cells, kept in sync with burn_progress
+        self.burning_idx       = np.empty(0, dtype=np.int32)
+
+        # Flat index step from a burning cell to each 8-connected neighbor,
+        # in fire_model._NEIGHBORS order (fixed for a given grid shape)
+        self.neighbor_offsets  = np.array([-cols - 1, -cols, -cols + 1,
+                                           -1,                +1,
+                                           cols - 1,  cols,  cols + 1], dtype=np.int32)
+
+    @classmethod
+    def state_from_bp(cls, bp):
+        """Fire state (UNBURNED/BURNING/BURNED) from burn progress; scalars or arrays."""
+        bp = np.asarray(bp)
+        return (bp > 0).astype(np.uint8) + (bp >= cls.BP_DONE)
+
+    @property
+    def flammability(self) -> np.ndarray:
+        """Per-cell flammability [0–1], expanded on demand from klass."""
+        return self.flammability_lut[self.klass]
+
+    @property
+    def grid_state(self) -> np.ndarray:
+        """
+        Per-cell fire state, computed on demand from burn_progress.
+
+        Returns a read-only snapshot: writes to it would not reach the
+        grid, so use ignite()/set_state() to change a cell.
+        """
+        state = self.state_from_bp(self.burn_progress)
+        state.flags.writeable = False
+        return state
 
     @classmethod
     def from_raster(cls, path: str, class_to_value: dict):
@@ -39,11 +91,11 @@ class FireGrid:
         - Loads raw landcover codes and maps to flammability.
         """
         with rasterio.open(path) as src:
-            raw        = src.read(1)
             transform  = src.transform
-            rows, cols = raw.shape
+            rows, cols = src.height, src.width
             res_x, res_y = src.res  # pixel size in CRS units
             crs = src.crs
+            raw = cls._read_band(src)
 
         # Determine cell size in metres
         if crs.is_geographic:
@@ -66,31 +118,124 @@ class FireGrid:
         grid.map_flammability(class_to_value)
         return grid
 
+    @staticmethod
+    def _read_band(src, max_workers: int = None) -> np.ndarray:
+        """
+        Read band 1 of an open dataset.  A compressed raster with enough
+        blocks is split into one contiguous band of block rows per worker and
+        decoded on a thread pool (GDAL releases the GIL while decoding).
+        Anything smaller is a single src.read(1), which is faster there.
+        """
+        block_h, block_w = src.block_shapes[0]
+        block_rows = math.ceil(src.height / block_h)
+        n_blocks   = block_rows * math.ceil(src.width / block_w)
+        workers    = min(max_workers or os.cpu_count() or 1,
+                         n_blocks // _BLOCKS_PER_WORKER, block_rows)
+        if src.compression is None or workers < 2:
+            return src.read(1)
+
+        raw   = np.empty((src.height, src.width), dtype=src.dtypes[0])
+        edges = [min(src.height, block_h * (block_rows * k // workers)) for k in range(workers + 1)]
+        bands = [Window(0, r0, src.width, r1 - r0) for r0, r1 in zip(edges, edges[1:])]
+
+        def read_into(handle, window):
+            handle.read(1, window=window, out=raw[window.toslices()])
+
+        def read_own(window):
+            # dataset handles are not thread-safe, so each extra worker opens its own
+            with rasterio.open(src.name) as handle:
+                read_into(handle, window)
+
+        with ThreadPoolExecutor(max_workers=workers - 1) as pool:
+            futures = [pool.submit(read_own, w) for w in bands[1:]]
+            read_into(src, bands[0])     # the caller's handle reads the first band
+            for f in futures:
+                f.result()               # re-raises worker errors
+        return raw
+
     def map_flammability(self, class_to_value: dict):
         """
-        Map integer landcover codes → flammability [0–1].
+        Map integer landcover codes → class index + flammability [0–1] LUT.
+        Class 0 is reserved for codes not in the map (flammability 0).
         """
         if self.landcover is None:
             raise RuntimeError("Load landcover first.")
-        f = np.zeros_like(self.landcover, dtype=np.float32)
-        for code, val in class_to_value.items():
-            f[self.landcover == code] = val
-        self.flammability = f
+        if len(class_to_value) > 255:
+            raise ValueError("At most 255 landcover classes fit in a uint8 class index.")
+
+        n     = len(class_to_value)
+        codes = np.fromiter(class_to_value.keys(),   dtype=np.int32,   count=n)
+        vals  = np.fromiter(class_to_value.values(), dtype=np.float32, count=n)
+
+        # dense code → class lookup table, plus class → flammability.  The
+        # table starts at min(codes, 0), so negative keys (e.g. nodata) get
+        # real slots.  The extra last slot is class 0 for unmapped codes:
+        # clipping sends codes above the table to it directly, and codes
+        # below it to -1, which take() also resolves to the last slot.
+        lo = min(int(codes.min()), 0) if n else 0
+        hi = int(codes.max()) if n else 0
+        code_to_klass = np.zeros(hi - lo + 2, dtype=np.uint8)
+        code_to_klass[codes - lo] = np.arange(1, n + 1)
+
+        self.klass            = code_to_klass.take(np.clip(self.landcover - lo, -1, hi - lo + 1))
+        self.flammability_lut = np.concatenate((np.zeros(1, dtype=np.float32), vals))
+
+    def landcover_rgb(self, class_color_map: dict, unknown_color) -> np.ndarray:
+        """
+        RGB image of the landcover, colored by class_color_map; codes missing
+        from it get unknown_color.  Landcover does not change after loading,
+        so the image is built once per color scheme and cached.
+        """
+        if self.landcover is None:
+            raise RuntimeError("Load landcover first.")
+        # colors may be tuples, lists or arrays: key on plain floats
+        key = (tuple(sorted((code, tuple(map(float, col))) for code, col in class_color_map.items())),
+               tuple(map(float, unknown_color)))
+        if key not in self._rgb_cache:
+            # one gather through a code → RGB table starting at min(codes, 0),
+            # with one extra row at the end for unknown / out-of-range codes
+            lo = min(min(class_color_map, default=0), 0)
+            hi = max(class_color_map, default=0)
+            color_lut = np.full((hi - lo + 2, 3), unknown_color, dtype=np.float32)
+            for code, col in class_color_map.items():
+                color_lut[code - lo] = col
+
+            lc = self.landcover
+            in_range = (lc >= lo) & (lc <= hi)
+            rgb = color_lut[np.where(in_range, lc - lo, hi - lo + 1)]
+            rgb.setflags(write=False)       # shared by every caller
+            self._rgb_cache[key] = rgb
+        return self._rgb_cache[key]
 
     def ignite(self, i: int, j: int):
         """Ignite cell (i,j) immediately."""
         if 0 <= i < self.rows and 0 <= j < self.cols:
-            self.grid_state[i, j]     = self.BURNING
-            self.burn_progress[i, j]     = 0.0
-            self.ignition_progress[i, j] = 0.0
+            self.set_state(i, j, self.BURNING)
+            self.burn_progress[i, j]     = self.BP_IGNITED
+            self.ignition_progress[i, j] = 0
 
     def get_state(self, i: int, j: int) -> int:
         """Return the fire state at (i,j)."""
         if 0 <= i < self.rows and 0 <= j < self.cols:
-            return int(self.grid_state[i, j])
+            return int(self.state_from_bp(self.burn_progress[i, j]))
         return None
 
     def set_state(self, i: int, j: int, state: int):
         """Manually override a cell’s fire state."""
+        bp_by_state = {
+            self.UNBURNED: 0,
+            self.BURNING:  self.BP_IGNITED,
+            self.BURNED:   self.BP_DONE,
+        }
+        if state not in bp_by_state:
+            raise ValueError(f"Unknown fire state {state!r}; expected UNBURNED, BURNING or BURNED.")
         if 0 <= i < self.rows and 0 <= j < self.cols:
-            self.grid_state[i, j] = state
+            prev = self.get_state(i, j)
+            if state == prev:
+                return
+            self.burn_progress[i, j] = bp_by_state[state]
+            idx = i * self.cols + j
+            if state == self.BURNING:
+                self.burning_idx = np.append(self.burning_idx, np.int32(idx))
+            elif prev == self.BURNING:
+                self.burning_idx = self.burning_idx[self.burning_idx != idx]
@@ -1,6 +1,8 @@
 # fire_simulator/fire_model.py
 
+import math
 import numpy as np
+from numba import njit
 from fire_simulator.fire_grid import FireGrid
 
 # 8-connected neighbor offsets, plus their (dx,dy) for wind alignment
@@ -16,139 +18,188 @@ _NEIGHBORS = [
     {'shift': (+1, +1), 'dx': +1, 'dy': -1},
 ]
 
+# Same table as plain tuples so Numba can freeze it into the kernel.
+# A burning cell spreads to cell + shift; the flat form of that step is
+# FireGrid.neighbor_offsets, and the column step catches row wrap-around.
+_NB_SJ = tuple(nb['shift'][1] for nb in _NEIGHBORS)
+_NB_DX = tuple(nb['dx'] for nb in _NEIGHBORS)
+_NB_DY = tuple(nb['dy'] for nb in _NEIGHBORS)
+
+# Burn-progress state markers as module globals (Numba cannot read class attributes)
+_PROGRESS_ONE = FireGrid.PROGRESS_ONE
+_BP_IGNITED   = FireGrid.BP_IGNITED
+_BP_DONE      = FireGrid.BP_DONE
+
 def update_fire(grid: FireGrid, dt: float, wind_speed: float, wind_dir_rad: float):
     """
-    Vectorized update of burn + ignition progress.
+    Advance burn + ignition progress by one timestep (JIT-compiled kernel over the burning front).
     """
-    gs  = grid.grid_state
-    bp  = grid.burn_progress
-    ip  = grid.ignition_progress
-    fl  = grid.flammability
-    cs  = grid.cell_size
-
-    # Burn‐out step (vectorized)
-    burning = (gs == FireGrid.BURNING)
-    # compute burn durations for ALL burning cells at once
-    bt = burn_duration(cs, fl[burning], wind_speed)          # 1D array for burning positions
-    # advance their progress
-    bp_flat = bp[burning] + (dt / bt)
-    # mark those that finish
-    done     = bp_flat >= 1.0
-    # update state & clamp
-    idxs     = np.nonzero(burning)
-    gs[idxs[0][done], idxs[1][done]] = FireGrid.BURNED
-    bp[idxs[0][done], idxs[1][done]] = 1.0
-    # leave others burning
-    bp[burning] = bp_flat
-    # now 'burning' mask should exclude newly‐burned
-    burning[idxs[0][done], idxs[1][done]] = False
-
-    # Spread/ignition step (vectorized over neighbors)
-    # Only unburned cells can ignite:
-    unburned = (gs == FireGrid.UNBURNED)
-
-    for nb in _NEIGHBORS:
-        # roll the burning mask into neighbor positions
-        shifted_burning = np.roll(burning, shift=nb['shift'], axis=(0,1))
-
-        # mask off the wrap-around edges
-        si, sj = nb['shift']
-        if si == -1:   shifted_burning[-1,:] = False
-        if si == +1:   shifted_burning[ 0,:] = False
-        if sj == -1:   shifted_burning[:, -1] = False
-        if sj == +1:   shifted_burning[:,  0] = False
-
-        # candidate ignition cells: currently unburned and adjacent to burning
-        candidates = shifted_burning & unburned
-
-        if not np.any(candidates):
-            continue
-
-        # directional dx, dy for these spread distances
-        dx = nb['dx']; dy = nb['dy']
-
-        # compute ignition times and rates for all candidates
-        f_nb     = fl[candidates]
-        it       = ignition_duration(cs, f_nb, wind_speed, wind_dir_rad, dx=dx, dy=dy)
-        rate_flat= dt / it
+    # nothing burning (not lit yet, or burned out): nothing can change
+    if grid.burning_idx.size == 0:
+        return
+
+    # ravel() of the C-contiguous grids is a view, so the kernel updates in place;
+    # it only touches the burning front (grid.burning_idx) and its neighbors
+    grid.burning_idx = _update_fire_kernel(
+        grid.burn_progress.ravel(), grid.ignition_progress.ravel(),
+        grid.klass.ravel(), grid.burning_idx, grid.neighbor_offsets, grid.rows, grid.cols,
+        grid.flammability_lut, grid.cell_size, dt, wind_speed, wind_dir_rad)
+
+@njit(cache=True)
+def seed(value: int):
+    """
+    Seed the generator used inside the fire kernel.  Numba keeps its own
+    random state, separate from NumPy's, so np.random.seed() does not reach it.
+    """
+    np.random.seed(value)
 
-        # advance their ignition progress
-        ip_flat = ip[candidates] + rate_flat
-        ip[candidates] = ip_flat
+# Fixed-point steps of at least this many units are rounded to nearest
+# (relative error <= 0.2%); smaller ones carry their fraction stochastically
+_EXACT_STEP = 256
 
-        # see which cross 1.0 this round
-        fires = ip_flat >= 1.0
-        if not np.any(fires):
+@njit(inline='always', cache=True)
+def _fixed_increment(rate: float):
+    """
+    Fractional progress per step → uint16 fixed-point increment, as
+    (whole units, remainder in 1/65536 units).  Large steps round to nearest
+    with no remainder.  Small steps (short dt, low flammability) keep their
+    remainder, which the kernel adds stochastically, so the expected
+    progress per step stays exact whatever dt is.
+    """
+    x = rate * _PROGRESS_ONE
+    if x <= 0.0:
+        return 0, 0
+    if x >= _EXACT_STEP:
+        return min(_PROGRESS_ONE, int(x + 0.5)), 0
+    whole = int(x)
+    return whole, int((x - whole) * 65536)
+
+@njit(inline='always', cache=True)
+def _draw_increment(whole, frac):
+    """One step of a (whole, remainder) increment: whole + 1 with probability frac / 65536."""
+    if frac != 0 and np.random.randint(0, 65536) < frac:
+        return whole + 1
+    return whole
+
+@njit(cache=True)
+def _step_tables(flam_lut, cell_size, dt, wind_speed, wind_dir_rad):
+    """
+    Loop-invariant per step: fixed-point burn increment and ignition threshold
+    per class, and spread increment per (neighbor direction, class), so the
+    kernel never divides.  Increments come as whole units + remainder.
+    """
+    n_classes   = flam_lut.size
+    burn_inc    = np.zeros(n_classes, dtype=np.uint16)
+    burn_frac   = np.zeros(n_classes, dtype=np.uint16)
+    spread_inc  = np.zeros((8, n_classes), dtype=np.uint16)
+    spread_frac = np.zeros((8, n_classes), dtype=np.uint16)
+    ign_thresh  = np.zeros(n_classes, dtype=np.uint16)
+    for c in range(n_classes):
+        f = flam_lut[c]
+        if f <= 0.0:            # never burns out, never ignites
             continue
+        burn_inc[c], burn_frac[c] = _fixed_increment(dt / burn_duration(cell_size, f, wind_speed))
+        for k in range(8):
+            sf = spread_factor(cell_size, wind_speed, wind_dir_rad, _NB_DX[k], _NB_DY[k])
+            spread_inc[k, c], spread_frac[k, c] = _fixed_increment(dt / ignition_duration(sf, f))
+        # threshold for a uniform draw in [0, PROGRESS_ONE)
+        ign_thresh[c] = min(_PROGRESS_ONE, int(ignition_probability(f) * _PROGRESS_ONE + 0.5))
+    return burn_inc, burn_frac, spread_inc, spread_frac, ign_thresh
+
+@njit(fastmath=True, boundscheck=False, cache=True)
+def _update_fire_kernel(bp, ip, klass, front, offsets, rows, cols,
+                        flam_lut, cell_size, dt, wind_speed, wind_dir_rad):
+    burn_inc, burn_frac, spread_inc, spread_frac, ign_thresh = _step_tables(
+        flam_lut, cell_size, dt, wind_speed, wind_dir_rad)
+
+    # Single pass over the front, which doubles as the snapshot of cells
+    # burning at the start of the step: each one advances its own burn, then
+    # pushes ignition progress into its unburned neighbors.  Serial, since two
+    # burning cells can share a neighbor; the work is O(8 * |front|).  Cells
+    # lit here are not in `front`, so they only start spreading next step.
+    n_cells   = rows * cols
+    survivors = np.empty(front.size, dtype=np.int32)
+    lit       = np.empty(8 * front.size, dtype=np.int32)
+    n_survivors = 0
+    n_lit       = 0
+    for p in front:
+        # burn-out (zero increment: zero flammability, infinite burn time)
+        c = klass[p]
+        b = bp[p] + _draw_increment(burn_inc[c], burn_frac[c])
+        if b >= _BP_DONE:
+            b = _BP_DONE
+        else:
+            survivors[n_survivors] = p
+            n_survivors += 1
+        bp[p] = b
+
+        # spread/ignition
+        j = p % cols
+        for k in range(8):
+            q  = p + offsets[k]
+            nj = j + _NB_SJ[k]
+            if q < 0 or q >= n_cells or nj < 0 or nj >= cols:
+                continue
+            c = klass[q]
+            inc  = spread_inc[k, c]
+            frac = spread_frac[k, c]
+            if bp[q] != 0 or (inc == 0 and frac == 0):   # already lit, or never ignites
+                continue
+            ip[q] = min(ip[q] + _draw_increment(inc, frac), _PROGRESS_ONE)
+
+            # stochastic trial once progress crosses 1.0: one draw per burning
+            # neighbor, straight from Numba's in-kernel generator (no batch
+            # array), as an integer compare against the class threshold
+            if ip[q] >= _PROGRESS_ONE and np.random.randint(0, _PROGRESS_ONE) < ign_thresh[c]:
+                bp[q] = _BP_IGNITED
+                ip[q] = 0
+                lit[n_lit] = q
+                n_lit += 1
+
+    # the new front: survivors plus this step's ignitions
+    return np.concatenate((survivors[:n_survivors], lit[:n_lit]))
 
-        # stochastic trial on those that crossed
-        pos_i, pos_j = np.nonzero(candidates)
-        pos_i = pos_i[fires]; pos_j = pos_j[fires]
-
-        # draw uniform and compare to ignition_probability
-        probs = ignition_probability(fl[candidates][fires])
-        randv = np.random.rand(len(probs))
-        ignite_mask = randv < probs
-
-        # ignite selected subset
-        ign_i = pos_i[ignite_mask]; ign_j = pos_j[ignite_mask]
-        gs[ign_i, ign_j] = FireGrid.BURNING
-        bp[ign_i, ign_j] = 0.0
-        ip[ign_i, ign_j] = 0.0
-
-    # commit back
-    grid.grid_state        = gs
-    grid.burn_progress     = bp
-    grid.ignition_progress = ip
-    
 # probability of ignition based on flammability
-def ignition_probability(flammability, base_prob: float = 1.0):
-    """
-    Vectorized probability [0–1] of igniting.  Works on scalars or arrays.
-    """
-    return np.minimum(1.0, base_prob * np.asarray(flammability, dtype=float))
-
-def fire_travel_time(cell_size: float,
-                     flammability,
-                     wind_speed: float,
-                     wind_dir_rad: float,
-                     dx: float,
-                     dy: float) -> np.ndarray:
+@njit(inline='always', cache=True)
+def ignition_probability(flammability: float, base_prob: float = 1.0) -> float:
+    "Probability [0–1] of igniting"
+    return min(1.0, base_prob * flammability)
+
+@njit(inline='always', cache=True)
+def spread_factor(cell_size: float, wind_speed: float, wind_dir_rad: float, dx: float, dy: float) -> float:
     """
-    Returns an array of travel times.  Zero‐flammability → infinite time.
+    (distance / 0.2) * wind_factor for a step of (dx, dy) cells.  Only
+    flammability varies per cell, so this is evaluated once per direction.
     """
-    # --- compute distance & direction once (scalars) ---
     if dx or dy:
-        distance      = np.hypot(dx, dy) * cell_size
-        cell_direction = np.arctan2(dy, dx)
+        distance       = math.hypot(dx, dy) * cell_size
+        cell_direction = math.atan2(dy, dx)
     else:
         distance       = cell_size
         cell_direction = 0.0
 
-    # wind‐alignment (scalar)
-    delta     = cell_direction - wind_dir_rad
-    sharpness = 1.5
-    align     = ((1 + np.cos(delta)) / 2) ** sharpness
+    # wind‐alignment
+    delta       = cell_direction - wind_dir_rad
+    sharpness   = 1.5
+    align       = ((1 + math.cos(delta)) / 2) ** sharpness
     wind_factor = 1.0 / (1.0 + wind_speed * align)
+    return (distance / 0.2) * wind_factor
 
-    # force flammability into a float array
-    f = np.asarray(flammability, dtype=float)
-
-    # compute (vectorized) but avoid warnings:
-    with np.errstate(divide='ignore', invalid='ignore'):
-        flame_factor = 1.0 / f
-        result = (distance / 0.2) * flame_factor * wind_factor
-        # wherever f <= 0, force to inf
-        result = np.where(f <= 0, np.inf, result)
-
-    return result
+@njit(inline='always', cache=True)
+def fire_travel_time(sf: float, flammability: float) -> float:
+    "Travel time for a spread factor.  Zero‐flammability → infinite time."
+    if flammability <= 0.0:
+        return np.inf
+    return sf / flammability
 
 # delay before neighbor ignites
-def ignition_duration(cell_size: float, flammability: float, wind_speed: float, wind_dir_rad: float, dx: float, dy: float) -> float:
+@njit(inline='always', cache=True)
+def ignition_duration(sf: float, flammability: float) -> float:
     "Delay before neighbor ignites"
-    return fire_travel_time(cell_size, flammability, wind_speed, wind_dir_rad, dx, dy)
+    return fire_travel_time(sf, flammability)
 
 # time for a cell to burn out in place
+@njit(inline='always', cache=True)
 def burn_duration(cell_size: float, flammability: float, wind_speed: float) -> float:
     "Time for a cell to burn out in place"
     min_slowdown = 5
@@ -156,4 +207,5 @@ def burn_duration(cell_size: float, flammability: float, wind_speed: float) -> f
     max_windspeed = 20.0  # m/s
     burn_slowdown = min_slowdown + (max_slowdown - min_slowdown) * (wind_speed/max_windspeed)  # linear slowdown
     burn_slowdown = 5
-    return burn_slowdown * fire_travel_time(cell_size, flammability, wind_speed, 0.0, dx=0, dy=0)
+    # in place: one cell of distance, wind_dir 0 (fully aligned)
+    return burn_slowdown * fire_travel_time(spread_factor(cell_size, wind_speed, 0.0, 0, 0), flammability)
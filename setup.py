@@ -10,6 +10,7 @@ setup(
         "numpy>=1.24,<3",
         "matplotlib>=3.7,<4",
         "rasterio>=1.3.9,<2",
+        "numba>=0.58",
     ],
     entry_points={
         "console_scripts": [
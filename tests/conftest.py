@@ -0,0 +1,18 @@
+# Tests import the package as `fire_simulator`, the way `python -m fire_simulator`
+# is run (see README).  The checkout itself is that package, whatever its
+# directory is called, so register it under that name from `tests/..`.
+import importlib.util
+import os
+import sys
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if "fire_simulator" not in sys.modules:
+    _spec = importlib.util.spec_from_file_location(
+        "fire_simulator",
+        os.path.join(_ROOT, "__init__.py"),
+        submodule_search_locations=[_ROOT],
+    )
+    _pkg = importlib.util.module_from_spec(_spec)
+    sys.modules["fire_simulator"] = _pkg
+    _spec.loader.exec_module(_pkg)
@@ -0,0 +1,83 @@
+import glob
+import os
+
+import numpy as np
+import pytest
+import rasterio
+
+from fire_simulator import fire_grid
+from fire_simulator.fire_grid import FireGrid
+
+DATA_FILES = sorted(glob.glob(os.path.join(os.path.dirname(__file__), "..", "data", "*.tif*")))
+
+
+def _grid_with_landcover(codes) -> FireGrid:
+    lc = np.array([codes], dtype=np.int32)
+    grid = FireGrid(*lc.shape, cell_size=1.0)
+    grid.landcover = lc
+    return grid
+
+
+def test_map_flammability_unmapped_codes_are_zero():
+    grid = _grid_with_landcover([10, 30, 11, 0, -5, 1000])
+    grid.map_flammability({10: 1.0, 30: 0.8})
+    np.testing.assert_allclose(grid.flammability, [[1.0, 0.8, 0, 0, 0, 0]])
+
+
+def test_map_flammability_negative_codes():
+    grid = _grid_with_landcover([10, -1, -9999, 11, -2, 5000])
+    grid.map_flammability({10: 0.5, -1: 0.9, -9999: 0.3})
+    np.testing.assert_allclose(grid.flammability, [[0.5, 0.9, 0.3, 0, 0, 0]])
+
+
+def test_map_flammability_empty_map():
+    grid = _grid_with_landcover([10, -1])
+    grid.map_flammability({})
+    np.testing.assert_allclose(grid.flammability, [[0, 0]])
+
+
+def test_landcover_rgb_colors_and_unknown():
+    grid = _grid_with_landcover([10, -1, 11, -7])
+    unknown = (0.6, 0.8, 1.0)
+    rgb = grid.landcover_rgb({10: (0.0, 0.4, 0.0), -1: (0.0, 0.0, 0.5)}, unknown)
+    np.testing.assert_allclose(rgb[0], [(0.0, 0.4, 0.0), (0.0, 0.0, 0.5), unknown, unknown])
+
+
+def test_landcover_rgb_accepts_list_and_array_colors():
+    grid = _grid_with_landcover([10, 20])
+    rgb = grid.landcover_rgb({10: [0, 1, 0], 20: np.array([1.0, 0, 0])}, [0, 0, 1])
+    np.testing.assert_allclose(rgb[0], [(0, 1, 0), (1, 0, 0)])
+
+
+def test_landcover_rgb_is_cached_read_only():
+    grid = _grid_with_landcover([10, 20])
+    colors = {10: (0.0, 1.0, 0.0)}
+    rgb = grid.landcover_rgb(colors, (0, 0, 1))
+    assert grid.landcover_rgb(dict(colors), (0.0, 0.0, 1.0)) is rgb
+    assert not rgb.flags.writeable
+
+
+def test_set_state_rejects_unknown_state():
+    grid = FireGrid(2, 2, cell_size=1.0)
+    with pytest.raises(ValueError, match="Unknown fire state"):
+        grid.set_state(0, 0, 7)
+
+
+def test_grid_state_is_read_only_snapshot():
+    grid = FireGrid(2, 2, cell_size=1.0)
+    grid.ignite(0, 1)
+    state = grid.grid_state
+    assert state[0, 1] == FireGrid.BURNING
+    assert not state.flags.writeable
+
+
+@pytest.mark.parametrize("path", DATA_FILES, ids=os.path.basename)
+@pytest.mark.parametrize("blocks_per_worker", [fire_grid._BLOCKS_PER_WORKER, 1])
+def test_read_band_matches_single_read(path, blocks_per_worker, monkeypatch):
+    # blocks_per_worker=1 forces the banded thread-pool read on every compressed file
+    monkeypatch.setattr(fire_grid, "_BLOCKS_PER_WORKER", blocks_per_worker)
+    with rasterio.open(path) as src:
+        expected = src.read(1)
+        raw = FireGrid._read_band(src, max_workers=4)
+    assert raw.dtype == expected.dtype
+    np.testing.assert_array_equal(raw, expected)
@@ -0,0 +1,130 @@
+import numpy as np
+import pytest
+
+from fire_simulator import fire_model
+from fire_simulator.fire_grid import FireGrid
+from fire_simulator.fire_model import burn_duration, seed, update_fire
+
+
+def _burn_out_time(dt: float, flammability: float) -> float:
+    """Simulated time for a lone burning cell to burn out."""
+    grid = FireGrid(1, 1, cell_size=10.0)
+    grid.flammability_lut = np.array([flammability], dtype=np.float32)
+    grid.ignite(0, 0)
+    steps = 0
+    while grid.get_state(0, 0) == FireGrid.BURNING:
+        update_fire(grid, dt=dt, wind_speed=0.0, wind_dir_rad=0.0)
+        steps += 1
+    return steps * dt
+
+
+@pytest.mark.parametrize("dt", [1.0, 0.01])
+def test_burn_out_time_independent_of_dt(dt):
+    seed(0)
+    expected = burn_duration(10.0, 0.2, 0.0)
+    assert _burn_out_time(dt, 0.2) == pytest.approx(expected, rel=0.02)
+
+
+def _grid(klass_rows, lut=(0.0, 1.0)) -> FireGrid:
+    """Small grid with cell_size 1 and a class index per cell."""
+    klass = np.array(klass_rows, dtype=np.uint8)
+    grid = FireGrid(*klass.shape, cell_size=1.0)
+    grid.klass[:] = klass
+    grid.flammability_lut = np.array(lut, dtype=np.float32)
+    return grid
+
+
+def _step(grid: FireGrid, dt: float = 10.0):
+    """One step; with flammability 1 and dt=10 every neighbor ignites, nothing burns out."""
+    update_fire(grid, dt=dt, wind_speed=0.0, wind_dir_rad=0.0)
+
+
+def _burning(grid: FireGrid) -> set:
+    return {tuple(ij) for ij in np.argwhere(grid.grid_state == FireGrid.BURNING)}
+
+
+def _assert_front_in_sync(grid: FireGrid):
+    front = np.sort(grid.burning_idx)
+    assert np.array_equal(front, np.unique(front))
+    assert np.array_equal(front, np.flatnonzero(grid.grid_state == FireGrid.BURNING))
+
+
+@pytest.mark.parametrize("j, lit_cols", [(3, (2, 3)), (0, (0, 1))])
+def test_spread_does_not_wrap_across_rows(j, lit_cols):
+    # flat offsets from the last/first column land on the next/previous row's
+    # opposite edge; the column check must reject those
+    grid = _grid(np.ones((3, 4)))
+    grid.ignite(1, j)
+    _step(grid)
+    assert _burning(grid) == {(i, c) for i in range(3) for c in lit_cols}
+    _assert_front_in_sync(grid)
+
+
+@pytest.mark.parametrize("i, j, expected", [
+    (0, 0, {(0, 0), (0, 1), (1, 0), (1, 1)}),
+    (2, 2, {(2, 2), (2, 1), (1, 2), (1, 1)}),
+    (0, 2, {(0, 2), (0, 1), (1, 2), (1, 1)}),
+    (2, 0, {(2, 0), (2, 1), (1, 0), (1, 1)}),
+])
+def test_spread_stays_inside_first_and_last_rows(i, j, expected):
+    grid = _grid(np.ones((3, 3)))
+    grid.ignite(i, j)
+    _step(grid)
+    assert _burning(grid) == expected
+    _assert_front_in_sync(grid)
+
+
+def test_spread_stops_at_zero_flammability():
+    grid = _grid([[1, 1, 0, 1, 1]])
+    grid.ignite(0, 0)
+    for _ in range(50):
+        _step(grid)
+    state = grid.grid_state[0]
+    assert state[2] == FireGrid.UNBURNED and grid.ignition_progress[0, 2] == 0
+    assert np.all(state[3:] == FireGrid.UNBURNED)
+    assert np.all(state[:2] == FireGrid.BURNED)
+    assert grid.burning_idx.size == 0
+
+
+def test_burning_idx_tracks_manual_state_changes():
+    grid = _grid(np.ones((2, 3)))
+    grid.ignite(0, 1)
+    grid.ignite(0, 1)               # already burning: no duplicate
+    grid.ignite(1, 2)
+    _assert_front_in_sync(grid)
+    assert grid.burning_idx.size == 2
+
+    grid.set_state(0, 1, FireGrid.BURNED)
+    _assert_front_in_sync(grid)
+    grid.set_state(1, 2, FireGrid.UNBURNED)
+    _assert_front_in_sync(grid)
+    assert grid.burning_idx.size == 0
+
+    grid.set_state(1, 0, FireGrid.BURNING)
+    _assert_front_in_sync(grid)
+    assert grid.burning_idx.size == 1
+
+
+def test_burning_idx_tracks_in_kernel_burn_out():
+    seed(0)
+    grid = _grid(np.ones((4, 5)))
+    grid.ignite(1, 2)
+    for _ in range(20):
+        _step(grid, dt=3.0)
+        _assert_front_in_sync(grid)
+    assert grid.burning_idx.size == 0
+    assert np.all(grid.grid_state == FireGrid.BURNED)
+
+
+def test_update_fire_without_front_changes_nothing(monkeypatch):
+    def kernel(*args):
+        raise AssertionError("kernel called with an empty front")
+    monkeypatch.setattr(fire_model, "_update_fire_kernel", kernel)
+
+    grid = _grid(np.ones((2, 2)))
+    grid.ignition_progress[0, 1] = 123
+    bp, ip = grid.burn_progress.copy(), grid.ignition_progress.copy()
+    _step(grid)
+    assert np.array_equal(grid.burn_progress, bp)
+    assert np.array_equal(grid.ignition_progress, ip)
+    assert grid.burning_idx.size == 0
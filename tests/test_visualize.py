@@ -0,0 +1,81 @@
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import matplotlib
+matplotlib.use("Agg")
+
+import pytest
+
+from fire_simulator import visualize
+
+_EVEN_YUV420P = ['-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p']
+
+
+def _fake_run(working, calls, exc=None):
+    """subprocess.run stand-in: succeeds only for codecs in `working`."""
+    def run(cmd, **kwargs):
+        calls.append(cmd)
+        if exc is not None:
+            raise exc
+        codec = cmd[cmd.index('-c:v') + 1]
+        return SimpleNamespace(returncode=0 if codec in working else 1)
+    return run
+
+
+@pytest.fixture
+def linux(monkeypatch):
+    monkeypatch.setattr(sys, "platform", "linux")
+
+
+def _probed_codecs(calls):
+    return [cmd[cmd.index('-c:v') + 1] for cmd in calls]
+
+
+def test_prefers_nvenc_and_probes_its_exact_args(monkeypatch, linux):
+    calls = []
+    monkeypatch.setattr(subprocess, "run", _fake_run({'h264_nvenc', 'h264_qsv'}, calls))
+    codec, extra_args = visualize.pick_video_codec()
+    assert (codec, extra_args) == ('h264_nvenc', ['-preset', 'p1', *_EVEN_YUV420P])
+    assert _probed_codecs(calls) == ['h264_nvenc']
+    probe = calls[0]
+    i = probe.index('-c:v')
+    assert probe[i + 2:i + 2 + len(extra_args)] == extra_args
+
+
+def test_falls_through_to_qsv(monkeypatch, linux):
+    calls = []
+    monkeypatch.setattr(subprocess, "run", _fake_run({'h264_qsv'}, calls))
+    assert visualize.pick_video_codec() == ('h264_qsv', ['-preset', 'veryfast', *_EVEN_YUV420P])
+    assert _probed_codecs(calls) == ['h264_nvenc', 'h264_qsv']
+
+
+def test_videotoolbox_first_on_macos(monkeypatch):
+    calls = []
+    monkeypatch.setattr(sys, "platform", "darwin")
+    monkeypatch.setattr(subprocess, "run", _fake_run({'h264_videotoolbox', 'h264_nvenc'}, calls))
+    assert visualize.pick_video_codec() == ('h264_videotoolbox', _EVEN_YUV420P)
+    assert _probed_codecs(calls) == ['h264_videotoolbox']
+
+
+def test_software_fallback_when_no_encoder_works(monkeypatch, linux):
+    calls = []
+    monkeypatch.setattr(subprocess, "run", _fake_run(set(), calls))
+    assert visualize.pick_video_codec() == (None, None)
+    assert _probed_codecs(calls) == ['h264_nvenc', 'h264_qsv']
+
+
+def test_software_fallback_without_ffmpeg(monkeypatch, linux):
+    calls = []
+    monkeypatch.setattr(subprocess, "run", _fake_run(set(), calls, exc=FileNotFoundError()))
+    assert visualize.pick_video_codec() == (None, None)
+    assert len(calls) == 1
+
+
+def test_software_fallback_uses_rcparams_codec(monkeypatch, linux):
+    from matplotlib.animation import FFMpegWriter
+    monkeypatch.setattr(subprocess, "run", _fake_run(set(), []))
+    codec, extra_args = visualize.pick_video_codec()
+    with matplotlib.rc_context({'animation.codec': 'mpeg4'}):
+        writer = FFMpegWriter(fps=10, codec=codec, extra_args=extra_args)
+    assert writer.codec == 'mpeg4'
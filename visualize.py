@@ -1,5 +1,7 @@
 # fire_simulator/visualize.py
 
+import subprocess
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.patches import Patch
@@ -8,6 +10,13 @@ from matplotlib.patches import FancyArrowPatch
 from .fire_grid import FireGrid
 from .fire_model import update_fire
 
+# Fire overlay color per cell state (indexed by FireGrid.UNBURNED/BURNING/BURNED)
+RGBA_BY_STATE = np.array([
+    [0.0,   0.0,   0.0,   0.0],   # unburned: transparent
+    [0.545, 0.0,   0.0,   0.9],   # burning:  dark red
+    [0.212, 0.212, 0.212, 0.9],   # burned:   dark gray
+], dtype=np.float32)
+
 def format_time(seconds: float) -> str:
     """Convert a number of seconds into HhMmSs string."""
     total = int(round(seconds))
@@ -24,6 +33,45 @@ def format_time(seconds: float) -> str:
         parts.append(f"{s}sec")
     return "".join(parts)
 
+# Hardware H.264 encoders to try, with their fastest preset
+_HW_CODEC_ARGS = {
+    'h264_nvenc':        ['-preset', 'p1'],
+    'h264_videotoolbox': [],
+    'h264_qsv':          ['-preset', 'veryfast'],
+}
+
+# pad odd canvas sizes by one pixel, since 4:2:0 chroma needs even dimensions
+_PAD_TO_EVEN = 'pad=ceil(iw/2)*2:ceil(ih/2)*2'
+
+def pick_video_codec():
+    """
+    Return (codec, extra_args) for FFMpegWriter: the first hardware H.264
+    encoder the local ffmpeg can actually open (NVENC, VideoToolbox on
+    macOS, Quick Sync), else (None, None) so FFMpegWriter falls back to
+    rcParams['animation.codec'].
+    """
+    candidates = ['h264_nvenc', 'h264_qsv']
+    if sys.platform == 'darwin':
+        candidates.insert(0, 'h264_videotoolbox')
+
+    ffmpeg = plt.rcParams['animation.ffmpeg_path']
+    for codec in candidates:
+        # hardware encoders want 4:2:0 input, which needs even frame sizes;
+        # matplotlib only sets the format and rounds the canvas for 'h264'
+        extra_args = _HW_CODEC_ARGS[codec] + ['-vf', _PAD_TO_EVEN, '-pix_fmt', 'yuv420p']
+        # encoders can be compiled in without a usable device, and presets
+        # vary by ffmpeg version, so probe one odd-sized frame with the exact output args
+        probe = [ffmpeg, '-hide_banner', '-loglevel', 'error',
+                 '-f', 'lavfi', '-i', 'color=size=255x255', '-frames:v', '1',
+                 '-c:v', codec, *extra_args, '-f', 'null', '-']
+        try:
+            ok = subprocess.run(probe, capture_output=True, timeout=10).returncode == 0
+        except (OSError, subprocess.TimeoutExpired):
+            break   # no usable ffmpeg; let FFMpegWriter report it
+        if ok:
+            return codec, extra_args
+    return None, None
+
 def save_static_map(grid: FireGrid,
                     class_color_map: dict,
                     class_name_map: dict,
@@ -37,14 +85,8 @@ def save_static_map(grid: FireGrid,
       • bottom-left: legend for land-cover
       • bottom-right: horizontal colorbar for flammability
     """
-    rows, cols = grid.rows, grid.cols
-
     # Build RGB landcover image
-    rgb_lc = np.zeros((rows, cols, 3), dtype=float)
-    for code, col in class_color_map.items():
-        rgb_lc[grid.landcover == code] = col
-    mask_unknown = ~np.isin(grid.landcover, list(class_color_map.keys()))
-    rgb_lc[mask_unknown] = unknown_color
+    rgb_lc = grid.landcover_rgb(class_color_map, unknown_color)
 
     # Create figure with 2×2 GridSpec
     fig = plt.figure(figsize=(10, 5), dpi=150)
@@ -127,14 +169,10 @@ def visualize_fire(
     cell_size  = grid.cell_size  # metres per pixel
 
     # static background
-    rgb_bg = np.zeros((rows, cols, 3), float)
-    for code, col in class_color_map.items():
-        rgb_bg[grid.landcover == code] = col
-    mask_unknown = ~np.isin(grid.landcover, list(class_color_map.keys()))
-    rgb_bg[mask_unknown] = (0.6, 0.8, 1.0)
+    rgb_bg = grid.landcover_rgb(class_color_map, (0.6, 0.8, 1.0))
 
     # overlay for burning/burned
-    overlay = np.zeros((rows, cols, 4), float)
+    overlay = np.zeros((rows, cols, 4), np.float32)
 
     # figure + axes (no margins)
     fig, ax = plt.subplots(figsize=(8, 8), dpi=150)
@@ -239,7 +277,9 @@ def visualize_fire(
 
     # 10) optional recorder
     if record:
-        writer = FFMpegWriter(fps=record_fps)
+        codec, extra_args = pick_video_codec()
+        writer = FFMpegWriter(fps=record_fps, codec=codec, extra_args=extra_args)
+        print(f"Recording with {codec or plt.rcParams['animation.codec']} encoder")
         writer.setup(fig, record_path, dpi=150)
 
     # 11) frame update
@@ -251,11 +291,7 @@ def visualize_fire(
             sim.step()
 
         # update fire overlay
-        overlay[...,3] = 0.0
-        mask_b = (grid.grid_state == FireGrid.BURNING)
-        overlay[mask_b,:3] = (0.545,0.0,0.0); overlay[mask_b,3] = 0.9
-        mask_d = (grid.grid_state == FireGrid.BURNED)
-        overlay[mask_d,:3] = (0.212,0.212,0.212); overlay[mask_d,3] = 0.9
+        np.take(RGBA_BY_STATE, grid.state_from_bp(grid.burn_progress), axis=0, out=overlay)
         im_overlay.set_data(overlay)
 
         # — d) ARROW SIZING & POSITION